@@ -0,0 +1,185 @@
+import heapq
+import networkx as nx
+
+
+def travel_costs(system, depots):
+    """Travel cost (km) from every depot to every area.
+
+    One single-source Dijkstra per depot over the road graph. Areas a
+    road depot can't reach are left out - that depot can't supply them.
+    Depots with no roads at all ("Relief Center", areas in a scenario
+    without roads) use straight-line distance to every area. Returns {depot: {area: km}}.
+    """
+    costs = {}
+    for depot in depots:
+        location = system.node_location(depot)
+        if location is None:
+            raise ValueError(f"Unknown depot: {depot}")
+        depot_lat, depot_lon = location
+        if depot in system.G and system.G.degree(depot) > 0:
+            road_dist = nx.single_source_dijkstra_path_length(system.G, depot, weight='weight')
+            costs[depot] = {area_name: dist for area_name, dist in road_dist.items()
+                            if area_name in system.areas}
+            continue
+
+        depot_costs = {}
+        for area_name, info in system.areas.items():
+            depot_costs[area_name] = system.calculate_distance(depot_lat, depot_lon,
+                                                               info['lat'], info['lon'])
+        costs[depot] = depot_costs
+    return costs
+
+
+def unit_value(severity, cost):
+    """Value of delivering one unit - same scoring as allocate_relief"""
+    return severity * 10 - cost
+
+
+def greedy_allocation(system, demand, stock, costs):
+    """Heap-driven greedy split of depot stock across areas.
+
+    Every area sits in a max-heap keyed by the value of being served from
+    its cheapest depot. The best area is popped and filled from that depot;
+    if the depot has run dry in the meantime the area is pushed back with
+    its next-cheapest depot instead. O(N * D log N) for N areas, D depots.
+    """
+    remaining = dict(stock)
+    depots = list(remaining)
+    allocations = []
+    unmet = {}
+    if not depots:
+        unmet = {a: q for a, q in demand.items() if q > 0 and a in system.areas}
+        return allocations, unmet, remaining
+
+    heap = []
+    candidates = {}
+    for area_name, qty in demand.items():
+        if qty <= 0 or area_name not in system.areas:
+            continue
+        severity = system.areas[area_name]['severity']
+        ranked = sorted((d for d in depots if area_name in costs[d]),
+                        key=lambda d: costs[d][area_name])
+        if not ranked:
+            # No depot has a road to this area
+            unmet[area_name] = qty
+            continue
+        candidates[area_name] = ranked
+        best = ranked[0]
+        value = unit_value(severity, costs[best][area_name])
+        heapq.heappush(heap, (-value, area_name, 0))
+
+    needed = {area_name: demand[area_name] for area_name in candidates}
+    while heap:
+        _, area_name, choice = heapq.heappop(heap)
+        ranked = candidates[area_name]
+        depot = ranked[choice]
+
+        if remaining[depot] <= 0:
+            # Depot ran dry - retry with the next-cheapest one
+            if choice + 1 < len(ranked):
+                next_depot = ranked[choice + 1]
+                severity = system.areas[area_name]['severity']
+                value = unit_value(severity, costs[next_depot][area_name])
+                heapq.heappush(heap, (-value, area_name, choice + 1))
+            else:
+                unmet[area_name] = needed[area_name]
+            continue
+
+        qty = min(needed[area_name], remaining[depot])
+        remaining[depot] -= qty
+        needed[area_name] -= qty
+        allocations.append({
+            'name': area_name,
+            'depot': depot,
+            'quantity': qty,
+            'cost': costs[depot][area_name]
+        })
+
+        if needed[area_name] > 0:
+            # Partially filled - keep trying the remaining depots
+            heapq.heappush(heap, (-float('inf'), area_name, choice))
+
+    return allocations, unmet, remaining
+
+
+def exact_allocation(system, demand, stock, costs):
+    """Exact split using networkx min-cost flow.
+
+    source -> depot (capacity = stock) -> area (cost = -unit value)
+    -> sink (capacity = demand), with an arc only where the depot can
+    reach the area. The flow is the largest deliverable one, and among
+    those the cheapest, so it maximises the total severity-weighted
+    value. Only practical for smaller instances because it builds one
+    arc per depot/area pair.
+    """
+    flow_graph = nx.DiGraph()
+    flow_graph.add_node("_source")
+    flow_graph.add_node("_sink")
+
+    for depot, qty in stock.items():
+        flow_graph.add_edge("_source", ("depot", depot), capacity=qty, weight=0)
+
+    for area_name, qty in demand.items():
+        if qty <= 0 or area_name not in system.areas:
+            continue
+        severity = system.areas[area_name]['severity']
+        flow_graph.add_edge(("area", area_name), "_sink", capacity=qty, weight=0)
+        for depot in stock:
+            if area_name not in costs[depot]:
+                continue
+            # network_simplex needs integer weights - keep 0.01 km resolution
+            weight = -int(round(unit_value(severity, costs[depot][area_name]) * 100))
+            flow_graph.add_edge(("depot", depot), ("area", area_name), weight=weight)
+
+    flow = nx.max_flow_min_cost(flow_graph, "_source", "_sink")
+
+    allocations = []
+    remaining = dict(stock)
+    delivered = {}
+    for depot in stock:
+        for node, qty in flow.get(("depot", depot), {}).items():
+            if qty <= 0:
+                continue
+            area_name = node[1]
+            remaining[depot] -= qty
+            delivered[area_name] = delivered.get(area_name, 0) + qty
+            allocations.append({
+                'name': area_name,
+                'depot': depot,
+                'quantity': qty,
+                'cost': costs[depot][area_name]
+            })
+
+    unmet = {}
+    for area_name, qty in demand.items():
+        if qty > 0 and area_name in system.areas and delivered.get(area_name, 0) < qty:
+            unmet[area_name] = qty - delivered.get(area_name, 0)
+
+    allocations.sort(key=lambda a: unit_value(system.areas[a['name']]['severity'], a['cost']),
+                     reverse=True)
+    return allocations, unmet, remaining
+
+
+def allocate_supplies(system, demand, stock, method="greedy"):
+    """Divide depot stock across areas.
+
+    demand: {area name: units needed}
+    stock: {depot name: units available}; a depot is an area name or
+           "Relief Center"
+    method: "greedy" (heap-driven, scales to large scenarios) or
+            "exact" (min-cost flow, smaller scenarios)
+    """
+    if method not in ("greedy", "exact"):
+        raise ValueError(f"Unknown allocation method: {method}")
+
+    costs = travel_costs(system, list(stock))
+    if method == "exact":
+        allocations, unmet, remaining = exact_allocation(system, demand, stock, costs)
+    else:
+        allocations, unmet, remaining = greedy_allocation(system, demand, stock, costs)
+
+    return {
+        'allocations': allocations,
+        'unmet': unmet,
+        'remaining_stock': remaining
+    }
@@ -0,0 +1,143 @@
+from array import array
+from collections.abc import MutableMapping
+
+
+class AreaView(MutableMapping):
+    """Dict-style view of one area row, reads and writes go to the arrays"""
+
+    __slots__ = ('_store', '_index')
+    FIELDS = ('severity', 'lat', 'lon', 'served')
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, field):
+        store = self._store
+        if field == 'severity':
+            return store.severity[self._index]
+        if field == 'lat':
+            return store.lat[self._index]
+        if field == 'lon':
+            return store.lon[self._index]
+        if field == 'served':
+            return store.is_served(self._index)
+        raise KeyError(field)
+
+    def __setitem__(self, field, value):
+        store = self._store
+        if field == 'severity':
+            store.severity[self._index] = value
+        elif field == 'lat':
+            store.lat[self._index] = value
+        elif field == 'lon':
+            store.lon[self._index] = value
+        elif field == 'served':
+            store.set_served(self._index, value)
+        else:
+            raise KeyError(field)
+
+    def __delitem__(self, field):
+        raise TypeError("Area fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AreaStore(MutableMapping):
+    """Struct-of-arrays storage for areas.
+
+    Each area is a row index into typed arrays - int8 severity, float64
+    lat/lon and one bit of a bytearray for served - plus one entry in
+    the name -> row intern table. Behaves like the old
+    {name: {'severity', 'lat', 'lon', 'served'}} dict through AreaView.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.severity = array('b')
+        self.lat = array('d')
+        self.lon = array('d')
+        self.served_bits = bytearray()
+
+    def add(self, name, severity, lat, lon, served=None):
+        """Insert or overwrite an area, returns its row index.
+
+        served=None keeps an existing area's flag (new areas start unserved).
+        """
+        i = self.index.get(name)
+        if i is None:
+            i = len(self.names)
+            self.names.append(name)
+            self.index[name] = i
+            self.severity.append(severity)
+            self.lat.append(lat)
+            self.lon.append(lon)
+            if i % 8 == 0:
+                self.served_bits.append(0)
+        else:
+            self.severity[i] = severity
+            self.lat[i] = lat
+            self.lon[i] = lon
+        if served is not None:
+            self.set_served(i, served)
+        return i
+
+    def is_served(self, i):
+        return bool(self.served_bits[i >> 3] & (1 << (i & 7)))
+
+    def set_served(self, i, served):
+        if served:
+            self.served_bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self.served_bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def __getitem__(self, name):
+        return AreaView(self, self.index[name])
+
+    def __setitem__(self, name, info):
+        self.add(name, info['severity'], info['lat'], info['lon'], info.get('served', False))
+
+    def __delitem__(self, name):
+        # Move the last row into the freed slot to keep the arrays dense
+        i = self.index.pop(name)
+        last = len(self.names) - 1
+        if i != last:
+            moved = self.names[last]
+            self.names[i] = moved
+            self.index[moved] = i
+            self.severity[i] = self.severity[last]
+            self.lat[i] = self.lat[last]
+            self.lon[i] = self.lon[last]
+            self.set_served(i, self.is_served(last))
+        self.names.pop()
+        self.severity.pop()
+        self.lat.pop()
+        self.lon.pop()
+        if last % 8 == 0:
+            self.served_bits.pop()
+        else:
+            self.set_served(last, False)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def nbytes(self):
+        """Bytes held by the typed columns (names and index not included)"""
+        return (self.severity.itemsize * len(self.severity)
+                + self.lat.itemsize * len(self.lat)
+                + self.lon.itemsize * len(self.lon)
+                + len(self.served_bits))
@@ -2,24 +2,151 @@ import networkx as nx
 import folium
 import webbrowser
 import os
+from area_store import AreaStore
+from allocation import allocate_supplies
+from simulation import run_dispatch_simulation
+from road_import import import_road_file
+from contraction_hierarchy import ContractionHierarchy, graph_fingerprint, hierarchy_from_bytes
+from whatif import run_what_if
+from reachability import ConnectivityIndex
+from isochrone import isochrone_bands, add_isochrone_layer
+from result_cache import (fingerprint, areas_fingerprint, scenario_fingerprint, build_route_table,
+                          table_route, route_table_survives, route_table_holds,
+                          road_snapshot, roads_fingerprint, road_changes)
 from math import radians, sin, cos, sqrt, atan2
 
+# NumPy is only needed for the aggregated raster rendering of large scenarios
+# and for depot placement / nearest-depot scoring
+try:
+    import numpy as np
+    from heatmap import use_raster, add_heatmap_overlay, area_columns
+    from depot_placement import place_depots, nearest_depot_km
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 class DisasterReliefSystem:
-    def __init__(self):
-        self.areas = {}
+    def __init__(self, store=None, cache=None):
+        self.areas = AreaStore()  # name -> dict-style view over typed columns
         self.roads = []
         self.G = nx.Graph()
         self.center_location = (28.6129, 77.2295)  # Default center (Delhi)
-        
-    def add_area(self, name, severity, lat, lon):
+        self.depots = {}  # depot name -> (lat, lon); the center serves everything when empty
+        self.store = store  # Optional ScenarioStore, kept in sync on every add
+        self.cache = cache  # Optional ResultCache for priority lists, routes and maps
+        self._route_tables = {}  # source -> shortest-path tree, see route_table
+        self._roads = None  # (fingerprint, snapshot) of the current roads, cached tables only
+        self._road_diffs = {}  # older roads fingerprint -> changes since, or None
+        self.road_geometry = {}  # (from, to) -> drawn points of imported roads
+        self.route_index = None  # Optional ContractionHierarchy for fast queries
+        self.connectivity = ConnectivityIndex()  # Road components for reachability checks
+    
+    def add_area(self, name, severity, lat, lon, persist=True):
         """Add area with coordinates"""
-        self.areas[name] = {'severity': severity, 'lat': lat, 'lon': lon, 'served': False}
-        self.G.add_node(name, severity=severity, lat=lat, lon=lon, served=False)
+        self.areas.add(name, severity, lat, lon)
+        # Area data lives in self.areas only, the graph node is just for routing
+        self.G.add_node(name)
+        if self.store is not None and persist:
+            self.store.save_area(name, severity, lat, lon)
     
-    def add_road(self, from_area, to_area, distance):
+    def mark_served(self, name, served=True, persist=True):
+        """Flag an area as having received relief, kept in the store too"""
+        if name not in self.areas:
+            return f"Error: Unknown area: {name}"
+        self.areas[name]['served'] = served
+        if self.store is not None and persist:
+            self.store.save_served(name, served)
+    
+    def add_road(self, from_area, to_area, distance, persist=True):
         """Add road between areas"""
+        if self.route_index is not None:
+            if self.G.has_edge(from_area, to_area):
+                # Re-weighting an existing road can lengthen routes too
+                self.route_index.stale = True
+            else:
+                self.route_index.note_road(from_area, to_area, distance)
         self.roads.append((from_area, to_area, distance))
         self.G.add_edge(from_area, to_area, weight=distance)
+        self.connectivity.union(from_area, to_area)
+        self._keep_route_tables(from_area, to_area, distance)
+        if self.store is not None and persist:
+            self.store.save_road(from_area, to_area, distance)
+    
+    def remove_road(self, from_area, to_area, persist=True):
+        """Remove a road, e.g. after it is cut by flooding"""
+        if not self.G.has_edge(from_area, to_area):
+            return False
+        
+        self.G.remove_edge(from_area, to_area)
+        self.roads = [road for road in self.roads
+                      if {road[0], road[1]} != {from_area, to_area}]
+        self.connectivity.dirty = True
+        self._keep_route_tables(from_area, to_area)
+        if self.route_index is not None:
+            self.route_index.stale = True
+        if self.store is not None and persist:
+            self.store.delete_road(from_area, to_area)
+        return True
+    
+    def is_reachable(self, start, target):
+        """True if a road path connects the two nodes (near-constant time)"""
+        return self.connectivity.connected(self.G, start, target)
+    
+    def unreachable_areas(self, depots):
+        """Areas with no road path to any of the given depots"""
+        if self.connectivity.dirty:
+            self.connectivity.rebuild(self.G)
+        roots = {self.connectivity.find(depot) for depot in depots if depot in self.G}
+        return [name for name in self.areas
+                if name not in self.G or self.connectivity.find(name) not in roots]
+    
+    def hydrate(self, min_severity=None, max_severity=None, bbox=None):
+        """Load areas matching a severity band / bounding box from the store,
+        plus the roads between them, without reading the rest of the database
+        
+        Imported road junctions inside bbox (all of them without one) are
+        loaded as well, so imported networks come back with their geometry.
+        """
+        if self.store is None:
+            return "Error: No scenario store attached!"
+        
+        loaded = []
+        for name, severity, lat, lon, served in self.store.iter_areas(min_severity, max_severity, bbox):
+            self.add_area(name, severity, lat, lon, persist=False)
+            self.areas[name]['served'] = served
+            loaded.append(name)
+        count = len(loaded)
+        
+        for name, lat, lon in self.store.iter_junctions(bbox):
+            self.G.add_node(name, lat=lat, lon=lon, junction=True)
+            loaded.append(name)
+        
+        for from_area, to_area, distance, geometry in self.store.iter_roads(loaded):
+            self.add_road(from_area, to_area, distance, persist=False)
+            if geometry is not None:
+                self.road_geometry[(from_area, to_area)] = geometry
+        
+        return count
+    
+    def import_roads(self, path, snap_radius=0.5):
+        """Bulk-import roads from a GeoJSON / CSV file
+        
+        Roads are snapped to areas within snap_radius km and chains of
+        shape points are contracted into single weighted edges. Returns
+        import statistics (vertices read, junctions and edges kept).
+        """
+        return import_road_file(self, path, snap_radius)
+    
+    def node_location(self, name):
+        """Coordinates of an area, road junction node or the relief center"""
+        if name in self.areas:
+            return self.areas[name]['lat'], self.areas[name]['lon']
+        if name == "Relief Center":
+            return self.center_location
+        node = self.G.nodes.get(name, {})
+        if 'lat' in node:
+            return node['lat'], node['lon']
+        return None
     
     def calculate_distance(self, lat1, lon1, lat2, lon2):
         """Calculate distance between two coordinates using Haversine formula"""
@@ -34,8 +161,130 @@ class DisasterReliefSystem:
         
         return R * c
     
+    def route_table(self, source):
+        """Shortest-path tree from source, read routes with table_route
+        
+        Tables survive road edits they are unaffected by (see
+        _keep_route_tables). With a ResultCache attached, a stored table
+        for the same source is reused when the roads changed since it was
+        computed leave it exact, e.g. in a scenario differing by one road.
+        """
+        if source not in self.G:
+            return {'dist': {}, 'pred': {}, 'roads_key': None}
+        if source in self._route_tables:
+            return self._route_tables[source]
+        
+        key = None
+        roads_key = None
+        table = None
+        if self.cache is not None:
+            roads_key = self._roads_key()
+            key = fingerprint('routes', source)
+            table = self.cache.get('routes', key)
+            if table is not None and table['roads_key'] != roads_key:
+                changes = self._changes_since(table['roads_key'])
+                if changes is None or not route_table_holds(table, changes):
+                    table = None
+        
+        if table is None:
+            table = build_route_table(self.G, source, roads_key)
+            if self.cache is not None:
+                self.cache.put('routes', key, table)
+        
+        self._route_tables[source] = table
+        return table
+    
+    def _roads_key(self):
+        """Fingerprint of the current roads; their snapshot is cached for later diffs"""
+        if self._roads is None:
+            snapshot = road_snapshot(self.G)
+            self._roads = (roads_fingerprint(snapshot), snapshot)
+            self.cache.put('roads', self._roads[0], snapshot)
+        return self._roads[0]
+    
+    def _changes_since(self, old_key):
+        """Road changes from a cached older network to the current one"""
+        if old_key not in self._road_diffs:
+            old = self.cache.get('roads', old_key)
+            self._road_diffs[old_key] = None if old is None else road_changes(old, self._roads[1])
+        return self._road_diffs[old_key]
+    
+    def _keep_route_tables(self, from_area, to_area, distance=None):
+        """Drop only the route tables a changed road (None = removed) affects"""
+        self._roads = None
+        self._road_diffs = {}
+        self._route_tables = {
+            source: table for source, table in self._route_tables.items()
+            if route_table_survives(table, from_area, to_area, distance)
+        }
+    
+    def build_route_index(self):
+        """Preprocess the road graph into a contraction hierarchy
+        
+        Afterwards dijkstra_shortest_path answers from the index. Roads
+        added later that can shorten a route mark it stale; queries then
+        fall back to a plain search until this is called again.
+        
+        A rebuild is a full re-contraction, not an incremental update: it
+        takes seconds on a few thousand road nodes (~2-4 s for a 50x50
+        grid, growing faster than linearly), so build the index once the
+        network is stable, not while roads are still being edited one by
+        one. check_route_index.py compares the index against networkx.
+        """
+        self.route_index = ContractionHierarchy(self.G)
+        return self.route_index
+    
+    def save_route_index(self, path=None):
+        """Save the route index to a file, or into the attached store"""
+        if self.route_index is None:
+            return "Error: No route index built!"
+        if self.route_index.stale:
+            return "Error: Route index is stale, call build_route_index first!"
+        # Roads added since the build that could not shorten any route
+        # leave the index valid, so record the current network with it
+        self.route_index.graph_key = graph_fingerprint(self.G)
+        data = self.route_index.to_bytes()
+        if path is None:
+            if self.store is None:
+                return "Error: No file or scenario store given!"
+            self.store.save_blob('route_index', data)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+    
+    def load_route_index(self, path=None):
+        """Load a saved route index, ignoring it if the roads have changed"""
+        if path is None:
+            data = self.store.load_blob('route_index') if self.store is not None else None
+        else:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None
+        if data is None:
+            return False
+        
+        try:
+            index = hierarchy_from_bytes(data)
+        except ValueError:
+            return False
+        if index.graph_key != graph_fingerprint(self.G):
+            return False
+        self.route_index = index
+        return True
+    
     def dijkstra_shortest_path(self, start, target):
         """Dijkstra's algorithm for shortest path"""
+        # Disconnected areas are answered from the index, no search needed
+        if start != target and not self.is_reachable(start, target):
+            return None, float('inf')
+        # A stale index is only rebuilt by an explicit build_route_index
+        # (seconds on large networks); until then answer without it
+        if self.route_index is not None and not self.route_index.stale:
+            return self.route_index.query(start, target)
+        if self.cache is not None:
+            return table_route(self.route_table(start), target)
         try:
             path = nx.dijkstra_path(self.G, start, target, weight='weight')
             distance = nx.dijkstra_path_length(self.G, start, target, weight='weight')
@@ -48,15 +297,33 @@ class DisasterReliefSystem:
         if not self.areas:
             return "Error: No areas added!"
         
-        # Priority based on severity and distance from center
+        if self.cache is not None:
+            cache_key = areas_fingerprint(self.areas, self.center_location, self.depots)
+            cached = self.cache.get('priority', cache_key)
+            if cached is not None:
+                return cached
+        
+        # Priority based on severity and distance from the nearest depot
+        # (the relief center until depots are placed)
         priority_list = []
+        depots = list(self.depots.items()) or [('Relief Center', self.center_location)]
         
-        for area_name, info in self.areas.items():
-            # Calculate distance from center
-            distance_from_center = self.calculate_distance(
-                self.center_location[0], self.center_location[1],
-                info['lat'], info['lon']
+        if HAS_NUMPY:
+            # One vectorised pass instead of a Python min per area
+            lat, lon, _ = area_columns(self.areas)
+            labels, distances = nearest_depot_km(
+                lat, lon,
+                np.array([location[0] for _, location in depots], dtype=np.float64),
+                np.array([location[1] for _, location in depots], dtype=np.float64))
+            nearest = zip((depots[j][0] for j in labels.tolist()), distances.tolist())
+        else:
+            nearest = (
+                min(((name, self.calculate_distance(dlat, dlon, info['lat'], info['lon']))
+                     for name, (dlat, dlon) in depots), key=lambda x: x[1])
+                for info in self.areas.values()
             )
+        
+        for (area_name, info), (depot, distance_from_center) in zip(self.areas.items(), nearest):
             
             # Priority score: higher severity = higher priority
             # Lower distance = higher priority
@@ -66,6 +333,7 @@ class DisasterReliefSystem:
                 'name': area_name,
                 'severity': info['severity'],
                 'distance': distance_from_center,
+                'depot': depot,
                 'priority_score': priority_score,
                 'lat': info['lat'],
                 'lon': info['lon']
@@ -74,10 +342,133 @@ class DisasterReliefSystem:
         # Sort by priority score (descending)
         priority_list.sort(key=lambda x: x['priority_score'], reverse=True)
         
+        if self.cache is not None:
+            self.cache.put('priority', cache_key, priority_list)
+        
         return priority_list
     
-    def generate_map(self, priority_list, shortest_path=None):
-        """Generate interactive map with Folium"""
+    def place_depots(self, k, iterations=20, road_refine=False, seed=0):
+        """Choose k depot sites among the areas (severity-weighted k-median)
+        
+        The chosen depots replace the single relief center when ranking
+        areas and are drawn on the map. road_refine re-checks each depot
+        against its nearby areas using road distances.
+        """
+        if not self.areas:
+            return "Error: No areas added!"
+        if not HAS_NUMPY:
+            return "Error: Depot placement needs NumPy!"
+        if k < 1:
+            return "Error: At least one depot is needed!"
+        
+        result = place_depots(self, k, iterations, seed, road_refine)
+        self.depots = {name: (self.areas[name]['lat'], self.areas[name]['lon'])
+                       for name in result['depots']}
+        return result
+    
+    def allocate_supplies(self, demand, stock, method="greedy"):
+        """Split finite depot stock (food kits, water, medical units) across areas
+        
+        demand: {area: units needed}, stock: {depot: units available}.
+        method="greedy" scales to very large scenarios, method="exact" solves
+        smaller ones optimally with min-cost flow.
+        """
+        if not self.areas:
+            return "Error: No areas added!"
+        unknown = [depot for depot in stock if self.node_location(depot) is None]
+        if unknown:
+            return f"Error: Unknown depot: {', '.join(unknown)}"
+        unknown = [area_name for area_name in demand if area_name not in self.areas]
+        if unknown:
+            return f"Error: Unknown area in demand: {', '.join(unknown)}"
+        
+        return allocate_supplies(self, demand, stock, method)
+    
+    def simulate_dispatch(self, vehicles=None, policy="priority", speed=40.0,
+                          service_time=0.5, escalation_interval=6.0, horizon=168.0):
+        """Time-based dispatch simulation with vehicles, travel and escalation
+        
+        vehicles: {depot: count}, defaults to one vehicle per placed depot.
+        Returns time-to-service statistics so dispatch policies
+        ("priority", "nearest") can be compared.
+        """
+        if not self.areas:
+            return "Error: No areas added!"
+        if vehicles is None:
+            vehicles = {depot: 1 for depot in self.depots}
+        if not vehicles:
+            return "Error: No vehicles given and no depots placed!"
+        unknown = [depot for depot in vehicles if self.node_location(depot) is None]
+        if unknown:
+            return f"Error: Unknown depot: {', '.join(unknown)}"
+        if not any(depot in self.G and self.G.degree(depot) > 0 for depot in vehicles):
+            return "Error: No vehicle depot has road access!"
+        
+        return run_dispatch_simulation(self, vehicles, policy, speed,
+                                       service_time, escalation_interval, horizon)
+    
+    def isochrones(self, source, thresholds=(10, 25, 50)):
+        """Areas within each road distance (km) of source, from one bounded search
+        
+        Returns {'bands': {threshold: [areas]}, 'distances': {area: km}, ...};
+        pass it to generate_map to draw the bands.
+        """
+        if source not in self.G:
+            return f"Error: {source} is not on the road network!"
+        if not thresholds:
+            return "Error: No distance thresholds given!"
+        if any(limit <= 0 for limit in thresholds):
+            return "Error: Distance thresholds must be positive!"
+        
+        return isochrone_bands(self, source, thresholds)
+    
+    def what_if_analysis(self, source, samples=1000, severity_sd=1.0, road_failure=0.05,
+                         top_k=10, workers=None):
+        """Monte Carlo what-if over uncertain severities and random road failures
+        
+        Returns per-area rank stability (mean rank, spread, chance of staying
+        in the top_k), probability of being reachable from source and the
+        expected route length when reachable.
+        """
+        if not self.areas:
+            return "Error: No areas added!"
+        if source not in self.G:
+            return f"Error: {source} is not on the road network!"
+        if samples < 1:
+            return "Error: At least one sample is needed!"
+        if top_k < 1:
+            return "Error: top_k must be at least 1!"
+        if not 0 <= road_failure <= 1:
+            return "Error: road_failure must be between 0 and 1!"
+        if severity_sd < 0:
+            return "Error: severity_sd cannot be negative!"
+        if workers is not None and workers < 1:
+            return "Error: At least one worker is needed!"
+        
+        return run_what_if(self, source, samples, severity_sd, road_failure, top_k, workers)
+    
+    def generate_map(self, priority_list, shortest_path=None, render_mode="auto", top_k=50,
+                     isochrones=None):
+        """Generate interactive map with Folium
+        
+        render_mode "raster" (or "auto" on large scenarios) draws all areas
+        as one severity density image and only the top_k priority areas as
+        markers; "markers" draws every area individually. isochrones (from
+        self.isochrones) are drawn as shaded distance bands.
+        """
+        map_file = "relief_map.html"
+        raster = HAS_NUMPY and bool(self.areas) and use_raster(len(self.areas), render_mode)
+        if self.cache is not None:
+            cache_key = fingerprint(
+                scenario_fingerprint(self.areas, self.G, self.center_location, self.depots),
+                priority_list, shortest_path, raster, top_k, isochrones
+            )
+            html = self.cache.get('map', cache_key)
+            if html is not None:
+                with open(map_file, "w", encoding="utf-8") as f:
+                    f.write(html)
+                return map_file
+        
         # Create base map centered on average of all locations
         if self.areas:
             lats = [info['lat'] for info in self.areas.values()]
@@ -101,6 +492,24 @@ class DisasterReliefSystem:
             icon=folium.Icon(color='blue', icon='home', prefix='fa')
         ).add_to(relief_map)
         
+        # Placed depots (see place_depots)
+        for name, (lat, lon) in self.depots.items():
+            folium.Marker(
+                [lat, lon],
+                popup=f'Depot: {name}',
+                tooltip=f'Depot: {name}',
+                icon=folium.Icon(color='darkblue', icon='truck', prefix='fa')
+            ).add_to(relief_map)
+        
+        # Service-radius bands underneath the markers
+        if isochrones:
+            add_isochrone_layer(relief_map, self, isochrones)
+        
+        # Large scenarios: one density image, markers for the top priorities only
+        if raster:
+            add_heatmap_overlay(relief_map, self.areas)
+            priority_list = priority_list[:top_k]
+        
         # Add area markers with color coding
         for i, area in enumerate(priority_list):
             # Determine color based on severity
@@ -141,10 +550,17 @@ class DisasterReliefSystem:
         # Add shortest path if provided
         if shortest_path and len(shortest_path) > 1:
             path_coordinates = []
-            for area_name in shortest_path:
-                if area_name in self.areas:
-                    info = self.areas[area_name]
-                    path_coordinates.append([info['lat'], info['lon']])
+            for i, node in enumerate(shortest_path):
+                # Follow the drawn shape of imported roads between nodes
+                if i > 0:
+                    prev = shortest_path[i - 1]
+                    if (prev, node) in self.road_geometry:
+                        path_coordinates.extend(list(p) for p in self.road_geometry[(prev, node)][1:-1])
+                    elif (node, prev) in self.road_geometry:
+                        path_coordinates.extend(list(p) for p in self.road_geometry[(node, prev)][-2:0:-1])
+                location = self.node_location(node)
+                if location is not None:
+                    path_coordinates.append(list(location))
             
             folium.PolyLine(
                 path_coordinates,
@@ -155,13 +571,20 @@ class DisasterReliefSystem:
             ).add_to(relief_map)
         
         # Save map
-        map_file = "relief_map.html"
         relief_map.save(map_file)
+        if self.cache is not None:
+            with open(map_file, "r", encoding="utf-8") as f:
+                self.cache.put('map', cache_key, f.read())
         return map_file
 
-def allocate_relief(input_file="input.txt"):
-    """Main function to run relief allocation"""
-    system = DisasterReliefSystem()
+def allocate_relief(input_file="input.txt", store=None, cache=None):
+    """Main function to run relief allocation
+    
+    If a ScenarioStore is given, areas/roads are upserted into it while
+    parsing and the finished report is recorded as a run. If a ResultCache
+    is given, priority lists, routes and the map are reused across runs.
+    """
+    system = DisasterReliefSystem(store, cache)
     
     try:
         with open(input_file, "r") as f:
@@ -169,6 +592,8 @@ def allocate_relief(input_file="input.txt"):
     except FileNotFoundError:
         return "Error: input.txt not found!"
     
+    demand = {}
+    stock = {}
     mode = None
     for line in lines:
         line = line.strip()
@@ -184,6 +609,12 @@ def allocate_relief(input_file="input.txt"):
         elif line == "COORDINATES":
             mode = "coordinates"
             continue
+        elif line == "DEMAND":
+            mode = "demand"
+            continue
+        elif line == "STOCK":
+            mode = "stock"
+            continue
             
         if mode == "areas":
             parts = line.split()
@@ -200,8 +631,8 @@ def allocate_relief(input_file="input.txt"):
                 lat = float(parts[-2])
                 lon = float(parts[-1])
                 if name in system.areas:
-                    system.areas[name]['lat'] = lat
-                    system.areas[name]['lon'] = lon
+                    # Re-add so the graph node (and the store) get the coordinates too
+                    system.add_area(name, system.areas[name]['severity'], lat, lon)
         
         elif mode == "roads":
             parts = line.split()
@@ -210,12 +641,33 @@ def allocate_relief(input_file="input.txt"):
                 to_area = parts[1]
                 distance = float(parts[2])
                 system.add_road(from_area, to_area, distance)
+        
+        elif mode == "demand":
+            parts = line.split()
+            if len(parts) >= 2:
+                name = " ".join(parts[:-1])
+                demand[name] = int(parts[-1])
+        
+        elif mode == "stock":
+            parts = line.split()
+            if len(parts) >= 2:
+                name = " ".join(parts[:-1])
+                stock[name] = int(parts[-1])
     
     # Run allocation
     priority_list = system.allocate_relief()
     
     # Generate result text
     result = "=== DISASTER RELIEF ALLOCATION REPORT ===\n\n"
+    
+    # Flag areas cut off from every supply depot before anything is routed
+    # (only STOCK depots on the road graph count - the relief center is not a road node)
+    road_depots = [depot for depot in stock if depot in system.G]
+    if road_depots:
+        unreachable = system.unreachable_areas(road_depots)
+        if unreachable:
+            result += "⚠️ NO ROAD ACCESS FROM ANY DEPOT:\n"
+            result += ", ".join(unreachable) + "\n\n"
     result += "PRIORITY ORDER FOR RELIEF DISTRIBUTION:\n"
     result += "=" * 50 + "\n"
     
@@ -225,12 +677,42 @@ def allocate_relief(input_file="input.txt"):
         
         result += f"{i+1}. {area['name']}\n"
         result += f"   Severity: {area['severity']}/10 | {status}\n"
-        result += f"   Distance from Center: {area['distance']:.1f} km\n"
+        if system.depots:
+            result += f"   Distance from Depot {area['depot']}: {area['distance']:.1f} km\n"
+        else:
+            result += f"   Distance from Center: {area['distance']:.1f} km\n"
         result += f"   Priority Score: {area['priority_score']:.1f}\n"
         result += "-" * 30 + "\n"
     
+    # Supply quantities per area (only when DEMAND and STOCK are given)
+    if demand and stock:
+        result += "\nSUPPLY ALLOCATION:\n"
+        result += "=" * 50 + "\n"
+        # Skip STOCK lines that name neither an area nor the relief center
+        for depot in stock:
+            if system.node_location(depot) is None:
+                result += f"⚠️ Unknown depot {depot} skipped\n"
+        known_stock = {depot: qty for depot, qty in stock.items()
+                       if system.node_location(depot) is not None}
+        # Likewise DEMAND lines for areas that were never added
+        for area_name in demand:
+            if area_name not in system.areas:
+                result += f"⚠️ Unknown area {area_name} in demand skipped\n"
+        known_demand = {area_name: qty for area_name, qty in demand.items()
+                        if area_name in system.areas}
+        supplies = system.allocate_supplies(known_demand, known_stock)
+        for alloc in supplies['allocations']:
+            result += f"{alloc['name']} <- {alloc['depot']}: {alloc['quantity']} units ({alloc['cost']:.1f} km)\n"
+        for area_name, qty in supplies['unmet'].items():
+            result += f"⚠️ {area_name}: {qty} units unmet\n"
+        for depot, qty in supplies['remaining_stock'].items():
+            result += f"{depot}: {qty} units left in stock\n"
+    
     # Generate map
     map_file = system.generate_map(priority_list)
     result += f"\n🗺️ Interactive map generated: {map_file}\n"
     
+    if store is not None:
+        store.save_run(result, priority_list, name=input_file)
+    
     return result, system, priority_list
\ No newline at end of file
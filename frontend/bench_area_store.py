@@ -0,0 +1,49 @@
+"""Memory benchmark: dict-per-area layout vs AreaStore
+
+Usage: python bench_area_store.py [number_of_areas]   (default 1,000,000)
+"""
+import random
+import sys
+import time
+import tracemalloc
+from area_store import AreaStore
+
+
+def build_dicts(rows):
+    areas = {}
+    for name, severity, lat, lon in rows:
+        areas[name] = {'severity': severity, 'lat': lat, 'lon': lon, 'served': False}
+    return areas
+
+
+def build_store(rows):
+    areas = AreaStore()
+    for name, severity, lat, lon in rows:
+        areas.add(name, severity, lat, lon)
+    return areas
+
+
+def generate_rows(count, seed=0):
+    """Rows as the input parser produces them, one fresh object per value"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield f"Area {i}", rng.randint(1, 10), 20 + rng.random() * 10, 70 + rng.random() * 15
+
+
+def measure(label, build, count):
+    tracemalloc.start()
+    start = time.time()
+    areas = build(generate_rows(count))
+    elapsed = time.time() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<14} {current / 2**20:8.1f} MiB held  {peak / 2**20:8.1f} MiB peak  {elapsed:6.2f} s")
+    return areas
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{count:,} areas")
+    measure("dict per area", build_dicts, count)
+    store = measure("AreaStore", build_store, count)
+    print(f"AreaStore typed columns: {store.nbytes() / 2**20:.1f} MiB")
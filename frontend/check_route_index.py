@@ -0,0 +1,92 @@
+"""Equivalence check: ContractionHierarchy queries vs networkx Dijkstra
+
+Builds random road graphs, compares every sampled query's distance and
+path against nx.dijkstra_path_length (on an index that went through
+to_bytes / hierarchy_from_bytes), then keeps adding roads through
+DisasterReliefSystem.add_road (exercising note_road, the fallback while
+stale and explicit rebuilds) and compares again. Exits non-zero on the
+first mismatch.
+
+Usage: python check_route_index.py [number_of_graphs]   (default 10)
+"""
+import random
+import sys
+import time
+import networkx as nx
+from backend import DisasterReliefSystem
+from contraction_hierarchy import ContractionHierarchy, hierarchy_from_bytes
+
+
+def random_system(rng, nodes, extra_edges):
+    """Random tree plus extra roads; a few nodes are left unconnected"""
+    system = DisasterReliefSystem()
+    names = [f"N{i}" for i in range(nodes)]
+    for name in names:
+        system.add_area(name, rng.randint(1, 10), 28 + rng.random(), 77 + rng.random())
+    for i in range(1, nodes - 3):
+        system.add_road(names[i], names[rng.randrange(i)], round(rng.uniform(1, 20), 1))
+    for _ in range(extra_edges):
+        a, b = rng.sample(names[:nodes - 3], 2)
+        system.add_road(a, b, round(rng.uniform(1, 20), 1))
+    return system, names
+
+
+def path_length(G, path):
+    return sum(G[a][b]['weight'] for a, b in zip(path, path[1:]))
+
+
+def check_queries(system, names, rng, samples, label):
+    for _ in range(samples):
+        start, target = rng.choice(names), rng.choice(names)
+        path, dist = system.dijkstra_shortest_path(start, target)
+        try:
+            expected = nx.dijkstra_path_length(system.G, start, target, weight='weight')
+        except nx.NetworkXNoPath:
+            expected = float('inf')
+
+        if expected == float('inf'):
+            ok = path is None and dist == expected
+        else:
+            ok = (path is not None and path[0] == start and path[-1] == target
+                  and abs(dist - expected) < 1e-6
+                  and abs(path_length(system.G, path) - expected) < 1e-6)
+        if not ok:
+            print(f"MISMATCH ({label}) {start} -> {target}: index {dist} {path}, networkx {expected}")
+            return False
+    return True
+
+
+def main(graphs):
+    rng = random.Random(0)
+    for g in range(graphs):
+        system, names = random_system(rng, rng.randint(20, 200), rng.randint(0, 300))
+        system.build_route_index()
+        system.route_index = hierarchy_from_bytes(system.route_index.to_bytes())
+        if not check_queries(system, names, rng, 200, f"graph {g}"):
+            return 1
+
+        # Incremental roads: some shorten routes (stale until rebuilt), some don't
+        for step in range(10):
+            a, b = rng.sample(names, 2)
+            system.add_road(a, b, round(rng.uniform(0.5, 30), 1))
+            if not check_queries(system, names, rng, 20, f"graph {g} after road {step}"):
+                return 1
+            if system.route_index.stale:
+                system.build_route_index()
+                if not check_queries(system, names, rng, 20, f"graph {g} rebuilt after road {step}"):
+                    return 1
+    print(f"{graphs} graphs: distances and paths match networkx")
+
+    # Rebuild cost, paid on the first query after a shortening road
+    side = 50
+    grid = nx.grid_2d_graph(side, side)
+    for u, v in grid.edges():
+        grid[u][v]['weight'] = rng.uniform(1, 10)
+    start = time.time()
+    ContractionHierarchy(grid)
+    print(f"{side}x{side} grid: index build {time.time() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
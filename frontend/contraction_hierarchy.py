@@ -0,0 +1,266 @@
+import heapq
+import json
+import zlib
+from result_cache import fingerprint
+
+
+def graph_fingerprint(G):
+    """Hash of the road network an index was built for"""
+    edges = sorted((min(u, v), max(u, v), float(w)) for u, v, w in G.edges(data='weight'))
+    return fingerprint('graph', sorted(G.nodes), edges)
+
+
+class ContractionHierarchy:
+    """Contraction-hierarchy index over an undirected weighted road graph.
+
+    Nodes are contracted one by one (cheapest edge difference first,
+    lazily re-evaluated); shortcuts keep distances between the remaining
+    nodes exact. A query then only relaxes edges going up the hierarchy
+    from both ends and meets in the middle, which settles a few hundred
+    nodes instead of the whole graph.
+    """
+
+    def __init__(self, G, witness_limit=200):
+        self.nodes = list(G.nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.graph_key = graph_fingerprint(G)
+        self.stale = False
+        self.witness_limit = witness_limit
+
+        adj = [{} for _ in self.nodes]
+        for u, v, w in G.edges(data='weight'):
+            a, b = self.index[u], self.index[v]
+            if a == b:
+                continue
+            if b not in adj[a] or w < adj[a][b]:
+                adj[a][b] = w
+                adj[b][a] = w
+
+        self.up = [[] for _ in self.nodes]  # (higher node, weight)
+        self.middle = {}  # (low, high) -> contracted node a shortcut skips
+        self.rank = [0] * len(self.nodes)
+        self.shortcuts = 0
+        self._contract(adj)
+
+    def _witness_distances(self, adj, source, skip, limit):
+        """Bounded Dijkstra from source that never passes through skip"""
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        settled = 0
+        while heap and settled < self.witness_limit:
+            d, u = heapq.heappop(heap)
+            if d > dist.get(u, float('inf')):
+                continue
+            if d > limit:
+                break
+            settled += 1
+            for v, w in adj[u].items():
+                if v == skip:
+                    continue
+                nd = d + w
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        return dist
+
+    def _needed_shortcuts(self, adj, v):
+        """Shortcuts required if v were contracted now"""
+        neighbors = list(adj[v].items())
+        needed = []
+        for i, (u, wu) in enumerate(neighbors):
+            later = neighbors[i + 1:]
+            if not later:
+                break
+            limit = wu + max(ww for _, ww in later)
+            witness = self._witness_distances(adj, u, v, limit)
+            for w, ww in later:
+                via = wu + ww
+                if witness.get(w, float('inf')) > via:
+                    needed.append((u, w, via))
+        return needed
+
+    def _contract(self, adj):
+        contracted_neighbors = [0] * len(self.nodes)
+        level = [0] * len(self.nodes)
+
+        def priority(v, needed):
+            # Edge difference, spread contraction evenly, keep the hierarchy shallow
+            return 2 * (len(needed) - len(adj[v])) + contracted_neighbors[v] + level[v]
+
+        heap = []
+        for v in range(len(self.nodes)):
+            heap.append((priority(v, self._needed_shortcuts(adj, v)), v))
+        heapq.heapify(heap)
+
+        order = 0
+        done = [False] * len(self.nodes)
+        while heap:
+            _, v = heapq.heappop(heap)
+            if done[v]:
+                continue
+            needed = self._needed_shortcuts(adj, v)
+            current = priority(v, needed)
+            if heap and current > heap[0][0]:
+                # Priority went stale since it was pushed - try again later
+                heapq.heappush(heap, (current, v))
+                continue
+
+            done[v] = True
+            self.rank[v] = order
+            order += 1
+
+            for u, w in adj[v].items():
+                self.up[v].append((u, w))
+                del adj[u][v]
+                contracted_neighbors[u] += 1
+                level[u] = max(level[u], level[v] + 1)
+            adj[v] = {}
+
+            for u, w, via in needed:
+                if via < adj[u].get(w, float('inf')):
+                    adj[u][w] = via
+                    adj[w][u] = via
+                    self.middle[(min(u, w), max(u, w))] = v
+                    self.shortcuts += 1
+
+    def query(self, start, target):
+        """Shortest (path, distance) between two nodes, (None, inf) if unreachable"""
+        if start not in self.index or target not in self.index:
+            return None, float('inf')
+        s, t = self.index[start], self.index[target]
+        if s == t:
+            return [start], 0
+
+        inf = float('inf')
+        up = self.up
+        dists = ({s: 0.0}, {t: 0.0})
+        parents = ({s: None}, {t: None})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        best = inf
+        meet = None
+
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                heap = heaps[side]
+                if not heap:
+                    continue
+                d, u = heapq.heappop(heap)
+                if d >= best:
+                    heap.clear()
+                    continue
+                dist = dists[side]
+                if d > dist[u]:
+                    continue
+                other = dists[1 - side].get(u)
+                if other is not None and d + other < best:
+                    best = d + other
+                    meet = u
+
+                # Stall-on-demand: u is reached more cheaply through a
+                # higher node, so nothing relaxed from it can be optimal
+                edges = up[u]
+                stalled = False
+                for v, w in edges:
+                    if dist.get(v, inf) + w < d:
+                        stalled = True
+                        break
+                if stalled:
+                    continue
+
+                parent = parents[side]
+                for v, w in edges:
+                    nd = d + w
+                    if nd < dist.get(v, inf):
+                        dist[v] = nd
+                        parent[v] = u
+                        heapq.heappush(heap, (nd, v))
+
+        if meet is None:
+            return None, float('inf')
+
+        # Up-edges from start to the meeting node, then down to target
+        hops = []
+        node = meet
+        while node is not None:
+            hops.append(node)
+            node = parents[0][node]
+        hops.reverse()
+        node = parents[1][meet]
+        while node is not None:
+            hops.append(node)
+            node = parents[1][node]
+
+        path = [hops[0]]
+        for a, b in zip(hops, hops[1:]):
+            self._unpack(a, b, path)
+        return [self.nodes[i] for i in path], best
+
+    def _unpack(self, a, b, path):
+        """Append the original nodes of edge a-b (excluding a) to path"""
+        stack = [(a, b)]
+        while stack:
+            x, y = stack.pop()
+            mid = self.middle.get((min(x, y), max(x, y)))
+            if mid is None:
+                path.append(y)
+            else:
+                stack.append((mid, y))
+                stack.append((x, mid))
+
+    def note_road(self, from_area, to_area, distance):
+        """Mark the index stale if a new road could shorten any route.
+
+        A road no shorter than the current route between its ends can't
+        improve any shortest path, so the index stays valid.
+        """
+        if self.stale:
+            return
+        if from_area not in self.index or to_area not in self.index:
+            self.stale = True
+            return
+        _, current = self.query(from_area, to_area)
+        if distance < current:
+            self.stale = True
+
+    def to_bytes(self):
+        """Plain JSON arrays (compressed), never pickle - saved indexes get shared"""
+        data = {
+            'graph_key': self.graph_key,
+            'witness_limit': self.witness_limit,
+            'nodes': self.nodes,
+            'up': self.up,
+            'middle': [[low, high, mid] for (low, high), mid in self.middle.items()],
+            'rank': self.rank,
+            'shortcuts': self.shortcuts,
+        }
+        return zlib.compress(json.dumps(data).encode('utf-8'))
+
+
+def hierarchy_from_bytes(data):
+    """Rebuild an index saved by to_bytes, ValueError if the data is malformed"""
+    try:
+        data = json.loads(zlib.decompress(data).decode('utf-8'))
+        nodes = data['nodes']
+        n = len(nodes)
+        up = [[(int(v), float(w)) for v, w in edges] for edges in data['up']]
+        middle = {(int(low), int(high)): int(mid) for low, high, mid in data['middle']}
+        rank = [int(r) for r in data['rank']]
+    except (zlib.error, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Malformed route index: {e}")
+    if len(up) != n or len(rank) != n or any(
+            not 0 <= v < n for edges in up for v, _ in edges) or any(
+            not (0 <= low < n and 0 <= high < n and 0 <= mid < n)
+            for (low, high), mid in middle.items()):
+        raise ValueError("Malformed route index: node reference out of range")
+
+    index = ContractionHierarchy.__new__(ContractionHierarchy)
+    index.nodes = nodes
+    index.index = {node: i for i, node in enumerate(nodes)}
+    index.graph_key = data['graph_key']
+    index.stale = False
+    index.witness_limit = data.get('witness_limit', 200)
+    index.up = up
+    index.middle = middle
+    index.rank = rank
+    index.shortcuts = data.get('shortcuts', len(middle))
+    return index
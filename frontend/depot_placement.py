@@ -0,0 +1,154 @@
+import numpy as np
+import networkx as nx
+from heatmap import area_columns
+
+
+# Rows per block when measuring area -> depot distances, bounds memory at ~1M areas
+CHUNK = 65536
+
+
+def planar_km(lat, lon):
+    """Project coordinates to a local x/y plane in km (equirectangular)"""
+    lat0 = np.radians(lat.mean())
+    return np.column_stack((lon * 111.32 * np.cos(lat0), lat * 110.57))
+
+
+def nearest_depot(points, depots):
+    """Index of and distance to the closest depot for every point"""
+    labels = np.empty(len(points), dtype=np.int64)
+    dist = np.empty(len(points), dtype=np.float64)
+    for start in range(0, len(points), CHUNK):
+        block = points[start:start + CHUNK]
+        d = np.sqrt(((block[:, None, :] - depots[None, :, :]) ** 2).sum(axis=2))
+        labels[start:start + CHUNK] = d.argmin(axis=1)
+        dist[start:start + CHUNK] = d[np.arange(len(block)), labels[start:start + CHUNK]]
+    return labels, dist
+
+
+def nearest_depot_km(lat, lon, depot_lat, depot_lon):
+    """Haversine nearest_depot on raw coordinates, same km as calculate_distance"""
+    lat, lon = np.radians(lat), np.radians(lon)
+    depot_lat, depot_lon = np.radians(depot_lat)[None, :], np.radians(depot_lon)[None, :]
+    labels = np.empty(len(lat), dtype=np.int64)
+    dist = np.empty(len(lat), dtype=np.float64)
+    for start in range(0, len(lat), CHUNK):
+        block_lat = lat[start:start + CHUNK, None]
+        block_lon = lon[start:start + CHUNK, None]
+        a = (np.sin((depot_lat - block_lat) / 2) ** 2
+             + np.cos(block_lat) * np.cos(depot_lat) * np.sin((depot_lon - block_lon) / 2) ** 2)
+        d = 6371 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        labels[start:start + CHUNK] = d.argmin(axis=1)
+        dist[start:start + CHUNK] = d[np.arange(len(d)), labels[start:start + CHUNK]]
+    return labels, dist
+
+
+def kmeans_plus_plus(points, weights, k, rng):
+    """Severity-weighted k-means++ seeding, returns area indices"""
+    chosen = [rng.choice(len(points), p=weights / weights.sum())]
+    closest = np.sqrt(((points - points[chosen[0]]) ** 2).sum(axis=1))
+    for _ in range(1, k):
+        p = weights * closest ** 2
+        total = p.sum()
+        if total <= 0:
+            break
+        nxt = rng.choice(len(points), p=p / total)
+        chosen.append(nxt)
+        closest = np.minimum(closest, np.sqrt(((points - points[nxt]) ** 2).sum(axis=1)))
+    return np.array(chosen)
+
+
+def weighted_median(points, weights, start, steps=10):
+    """Weiszfeld iterations towards the weighted geometric median"""
+    if weights.sum() <= 0:
+        return start
+    center = start
+    for _ in range(steps):
+        d = np.sqrt(((points - center) ** 2).sum(axis=1))
+        d = np.maximum(d, 1e-9)
+        w = weights / d
+        center = (points * w[:, None]).sum(axis=0) / w.sum()
+    return center
+
+
+def refine_with_roads(system, names, members, weights, candidates, road_cache):
+    """Among candidate areas pick the one with the lowest weighted road distance.
+
+    Road distances from each candidate come from one single-source search,
+    kept in road_cache so later iterations reuse them. Members without a
+    road connection count as very far away.
+    """
+    best, best_cost = candidates[0], float('inf')
+    for c in candidates:
+        name = names[c]
+        if name not in system.G:
+            continue
+        if name not in road_cache:
+            road_cache[name] = nx.single_source_dijkstra_path_length(system.G, name, weight='weight')
+        dist = road_cache[name]
+        cost = sum(w * dist.get(names[m], 1e6) for m, w in zip(members, weights))
+        if cost < best_cost:
+            best, best_cost = c, cost
+    return best
+
+
+def place_depots(system, k, iterations=20, seed=0, road_refine=False, refine_candidates=5):
+    """Choose k depot sites among the areas minimising severity-weighted distance.
+
+    Vectorised k-median: k-means++ seeding, then repeated assignment to
+    the nearest depot and a move of each depot to the area closest to its
+    cluster's weighted geometric median. With road_refine, each final
+    depot is compared with its nearest candidate areas by road distance.
+    """
+    if not system.areas:
+        raise ValueError("No areas to place depots among")
+    names = list(system.areas)
+    lat, lon, severity = area_columns(system.areas)
+    points = planar_km(lat, lon)
+    weights = severity.astype(np.float64)
+    if weights.sum() <= 0:
+        # Every severity is 0: weigh all areas equally instead of dividing by 0
+        weights = np.ones(len(names))
+    k = min(k, len(names))
+    rng = np.random.default_rng(seed)
+
+    depots = kmeans_plus_plus(points, weights, k, rng)
+    labels, dist = nearest_depot(points, points[depots])
+    cost = float((weights * dist).sum())
+
+    for _ in range(iterations):
+        moved = depots.copy()
+        for j in range(len(depots)):
+            members = np.flatnonzero(labels == j)
+            if len(members) == 0:
+                continue
+            median = weighted_median(points[members], weights[members], points[depots[j]])
+            # Depots must sit on an area: take the member nearest the median
+            offsets = ((points[members] - median) ** 2).sum(axis=1)
+            moved[j] = members[offsets.argmin()]
+
+        new_labels, new_dist = nearest_depot(points, points[moved])
+        new_cost = float((weights * new_dist).sum())
+        if new_cost >= cost:
+            break
+        depots, labels, dist, cost = moved, new_labels, new_dist, new_cost
+
+    if road_refine:
+        road_cache = {}
+        for j in range(len(depots)):
+            members = np.flatnonzero(labels == j)
+            if len(members) == 0:
+                continue
+            offsets = ((points[members] - points[depots[j]]) ** 2).sum(axis=1)
+            candidates = members[np.argsort(offsets)[:refine_candidates]]
+            depots[j] = refine_with_roads(system, names, members, weights[members],
+                                          candidates, road_cache)
+        # Refined depots moved, so reassign areas and report the new cost
+        labels, dist = nearest_depot(points, points[depots])
+        cost = float((weights * dist).sum())
+
+    assignment = {names[i]: names[depots[labels[i]]] for i in range(len(names))}
+    return {
+        'depots': [names[i] for i in depots],
+        'assignment': assignment,
+        'weighted_distance': cost
+    }
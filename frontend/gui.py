@@ -16,6 +16,13 @@ except ImportError:
     HAS_MATPLOTLIB = False
     print("Matplotlib not installed - Graph features disabled")
 
+# Try to import numpy for aggregated rendering of large scenarios
+try:
+    from heatmap import use_raster, severity_grid, grid_to_rgba, add_heatmap_overlay
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 class DisasterReliefSystem:
     def __init__(self):
         self.areas = {}
@@ -96,7 +103,7 @@ class DisasterReliefSystem:
         priority_list.sort(key=lambda x: x['priority_score'], reverse=True)
         return priority_list
     
-    def create_graph_visualization(self):
+    def create_graph_visualization(self, priority_list=None, render_mode="auto", top_k=20):
         """Network graph create karta hai"""
         if not HAS_MATPLOTLIB or not self.areas:
             return None
@@ -105,6 +112,33 @@ class DisasterReliefSystem:
             # Create figure
             fig, ax = plt.subplots(figsize=(10, 8))
             
+            # Large scenarios: one density image instead of one artist per area
+            if HAS_NUMPY and use_raster(len(self.areas), render_mode):
+                grid, (min_lat, min_lon, max_lat, max_lon) = severity_grid(self.areas)
+                ax.imshow(grid_to_rgba(grid), extent=[min_lon, max_lon, min_lat, max_lat],
+                          origin='upper', aspect='auto', interpolation='nearest')
+                
+                # Only the top priority areas get their own marker and label
+                top = (priority_list or [])[:top_k]
+                colors = ['red' if a['severity'] >= 8 else 'orange' if a['severity'] >= 5 else 'green'
+                          for a in top]
+                ax.scatter([a['lon'] for a in top], [a['lat'] for a in top], c=colors,
+                           s=80, edgecolors='black', zorder=3)
+                for i, area in enumerate(top):
+                    ax.annotate(f"{i+1}. {area['name']}", (area['lon'], area['lat']),
+                                fontsize=7, fontweight='bold', xytext=(4, 4), textcoords='offset points')
+                ax.scatter([self.center_location[1]], [self.center_location[0]], c='blue',
+                           s=250, marker='*', zorder=4)
+                
+                ax.set_title(f"Severity Density - {len(self.areas)} areas (top {len(top)} priorities marked)\n"
+                            "Green: Low  Yellow: Medium  Red: High density  ★ Relief Center",
+                            fontsize=12, fontweight='bold')
+                ax.set_xlabel("Longitude")
+                ax.set_ylabel("Latitude")
+                fig.patch.set_facecolor('#f8f9fa')
+                plt.tight_layout()
+                return fig
+            
             # Create position dictionary
             pos = {}
             node_colors = []
@@ -158,7 +192,7 @@ class DisasterReliefSystem:
             print(f"Graph creation error: {e}")
             return None
     
-    def generate_folium_map(self, priority_list):
+    def generate_folium_map(self, priority_list, render_mode="auto", top_k=50):
         """Real Folium map generate karta hai"""
         try:
             if not self.areas:
@@ -182,6 +216,11 @@ class DisasterReliefSystem:
                 icon=folium.Icon(color='blue', icon='home')
             ).add_to(relief_map)
             
+            # Large scenarios: density overlay, markers only for top priorities
+            if HAS_NUMPY and use_raster(len(self.areas), render_mode):
+                add_heatmap_overlay(relief_map, self.areas)
+                priority_list = priority_list[:top_k]
+            
             # Add area markers
             for i, area in enumerate(priority_list):
                 if area['severity'] >= 8:
@@ -576,7 +615,7 @@ class DisasterReliefApp:
                 widget.destroy()
             
             # Create new graph
-            fig = self.system.create_graph_visualization()
+            fig = self.system.create_graph_visualization(self.priority_list)
             if fig:
                 canvas = FigureCanvasTkAgg(fig, self.graph_display_frame)
                 canvas.draw()
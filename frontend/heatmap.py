@@ -0,0 +1,81 @@
+import numpy as np
+import folium
+
+
+# Above this many areas maps and graphs switch to the aggregated raster
+RASTER_THRESHOLD = 2000
+
+
+def use_raster(area_count, render_mode="auto"):
+    """Decide between one marker per area and the aggregated raster"""
+    if render_mode == "auto":
+        return area_count > RASTER_THRESHOLD
+    return render_mode == "raster"
+
+
+def area_columns(areas):
+    """lat, lon and severity of all areas as NumPy arrays.
+
+    An AreaStore's typed columns are wrapped without copying; a plain
+    dict of dicts is read once.
+    """
+    if hasattr(areas, 'lat') and hasattr(areas, 'severity'):
+        lat = np.frombuffer(areas.lat, dtype=np.float64)
+        lon = np.frombuffer(areas.lon, dtype=np.float64)
+        severity = np.frombuffer(areas.severity, dtype=np.int8)
+        return lat, lon, severity
+
+    count = len(areas)
+    lat = np.fromiter((info['lat'] for info in areas.values()), dtype=np.float64, count=count)
+    lon = np.fromiter((info['lon'] for info in areas.values()), dtype=np.float64, count=count)
+    severity = np.fromiter((info['severity'] for info in areas.values()), dtype=np.int8, count=count)
+    return lat, lon, severity
+
+
+def severity_grid(areas, resolution=256):
+    """Bin areas into a resolution x resolution severity-weighted density grid.
+
+    Returns (grid, bounds) with grid rows running north to south and
+    bounds = (min_lat, min_lon, max_lat, max_lon).
+    """
+    lat, lon, severity = area_columns(areas)
+    min_lat, max_lat = float(lat.min()), float(lat.max())
+    min_lon, max_lon = float(lon.min()), float(lon.max())
+    # Keep a non-zero extent when every area shares a coordinate
+    if max_lat - min_lat < 1e-6:
+        min_lat, max_lat = min_lat - 0.01, max_lat + 0.01
+    if max_lon - min_lon < 1e-6:
+        min_lon, max_lon = min_lon - 0.01, max_lon + 0.01
+
+    grid, _, _ = np.histogram2d(
+        lat, lon, bins=resolution,
+        range=[[min_lat, max_lat], [min_lon, max_lon]],
+        weights=severity.astype(np.float64)
+    )
+    return grid[::-1], (min_lat, min_lon, max_lat, max_lon)
+
+
+def grid_to_rgba(grid):
+    """Colour a density grid green -> yellow -> red, empty cells transparent"""
+    scaled = np.log1p(grid)
+    peak = scaled.max()
+    t = scaled / peak if peak > 0 else scaled
+
+    rgba = np.zeros(grid.shape + (4,), dtype=np.uint8)
+    rgba[..., 0] = np.clip(2 * t, 0, 1) * 255
+    rgba[..., 1] = np.clip(2 * (1 - t), 0, 1) * 255
+    rgba[..., 3] = np.where(grid > 0, 90 + 165 * t, 0)
+    return rgba
+
+
+def add_heatmap_overlay(relief_map, areas, resolution=256):
+    """Draw all areas as a single severity image overlay on a Folium map"""
+    grid, (min_lat, min_lon, max_lat, max_lon) = severity_grid(areas, resolution)
+    folium.raster_layers.ImageOverlay(
+        image=grid_to_rgba(grid),
+        bounds=[[min_lat, min_lon], [max_lat, max_lon]],
+        name='Severity density',
+        mercator_project=True,
+        interactive=False,
+        zindex=1
+    ).add_to(relief_map)
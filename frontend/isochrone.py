@@ -0,0 +1,87 @@
+import networkx as nx
+import folium
+
+
+# Band fill colours from the nearest band outwards
+BAND_COLORS = ['#2ca25f', '#fdae61', '#d7191c', '#7b3294', '#404040']
+
+
+def isochrone_bands(system, source, thresholds=(10, 25, 50)):
+    """Areas reachable from source within each road-distance threshold.
+
+    One Dijkstra search bounded at the largest threshold answers every
+    band, so the work grows with the reachable region, not the area
+    count. Bands are exclusive: an area 18 km away is only listed
+    under 25.
+    """
+    thresholds = sorted(thresholds)
+    dist = nx.single_source_dijkstra_path_length(system.G, source, cutoff=thresholds[-1],
+                                                 weight='weight')
+
+    bands = {limit: [] for limit in thresholds}
+    distances = {}
+    for node, d in dist.items():
+        if node not in system.areas or node == source:
+            continue
+        distances[node] = d
+        for limit in thresholds:
+            if d <= limit:
+                bands[limit].append(node)
+                break
+
+    return {
+        'source': source,
+        'thresholds': thresholds,
+        'bands': bands,
+        'distances': distances
+    }
+
+
+def convex_hull(points):
+    """Monotone-chain convex hull of (lat, lon) points"""
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def add_isochrone_layer(relief_map, system, isochrones):
+    """Shade each distance band as a polygon, widest band underneath"""
+    source = system.node_location(isochrones['source'])
+    inside = [source] if source is not None else []
+    hulls = []
+    for limit in isochrones['thresholds']:
+        for name in isochrones['bands'][limit]:
+            info = system.areas[name]
+            inside.append((info['lat'], info['lon']))
+        hulls.append((limit, convex_hull(inside)))
+
+    for i in reversed(range(len(hulls))):
+        limit, hull = hulls[i]
+        if len(hull) < 3:
+            continue
+        color = BAND_COLORS[min(i, len(BAND_COLORS) - 1)]
+        count = sum(len(isochrones['bands'][t]) for t in isochrones['thresholds'][:i + 1])
+        folium.Polygon(
+            locations=[list(p) for p in hull],
+            color=color,
+            weight=2,
+            fill=True,
+            fill_color=color,
+            fill_opacity=0.15,
+            popup=f"Within {limit} km by road: {count} areas"
+        ).add_to(relief_map)
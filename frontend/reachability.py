@@ -0,0 +1,51 @@
+class ConnectivityIndex:
+    """Union-find over road endpoints answering "is X reachable from Y".
+
+    Roads are merged in as they are added; removing a road can split a
+    component, which union-find can't undo, so removals just mark the
+    index dirty and it is rebuilt from the graph on the next question.
+    """
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+        self.dirty = False
+
+    def find(self, node):
+        parent = self.parent
+        if node not in parent:
+            parent[node] = node
+            self.size[node] = 1
+            return node
+        while parent[node] != node:
+            # Path halving keeps the trees almost flat
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def rebuild(self, G):
+        self.parent = {}
+        self.size = {}
+        for node in G.nodes:
+            self.find(node)
+        for u, v in G.edges():
+            self.union(u, v)
+        self.dirty = False
+
+    def connected(self, G, a, b):
+        if self.dirty:
+            self.rebuild(G)
+        if a == b:
+            return True
+        if a not in self.parent or b not in self.parent:
+            return False
+        return self.find(a) == self.find(b)
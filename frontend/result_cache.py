@@ -0,0 +1,180 @@
+import hashlib
+import math
+import os
+import pickle
+import networkx as nx
+
+
+# Bump when the scoring formula or result layout changes so old entries miss
+CACHE_VERSION = 1
+
+
+def fingerprint(*parts):
+    """Stable content hash of plain Python values"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def areas_fingerprint(areas, center_location, depots=None):
+    """Hash of everything allocate_relief looks at"""
+    rows = sorted((name, info['severity'], info['lat'], info['lon']) for name, info in areas.items())
+    return fingerprint('areas', CACHE_VERSION, rows, tuple(center_location),
+                       sorted((depots or {}).items()))
+
+
+def road_snapshot(G):
+    """{(end, end): weight} of every road, ends sorted"""
+    return {(min(u, v), max(u, v)): float(w) for u, v, w in G.edges(data='weight')}
+
+
+def roads_fingerprint(snapshot):
+    return fingerprint('roads', CACHE_VERSION, sorted(snapshot.items()))
+
+
+def road_changes(old, new):
+    """[(u, v, new weight or None if removed)] turning snapshot old into new"""
+    changes = [(u, v, w) for (u, v), w in new.items() if old.get((u, v)) != w]
+    changes.extend((u, v, None) for (u, v) in old if (u, v) not in new)
+    return changes
+
+
+def build_route_table(G, source, roads_key=None):
+    """Shortest-path tree from source: {'dist': {node: km}, 'pred': {node: parent}}.
+
+    Only one parent per node is kept, routes are rebuilt by walking it, so
+    a table is O(nodes) instead of one full path per target. roads_key
+    records which road network the table was computed on.
+    """
+    preds, dist = nx.dijkstra_predecessor_and_distance(G, source, weight='weight')
+    pred = {node: (parents[0] if parents else None) for node, parents in preds.items()}
+    return {'dist': dist, 'pred': pred, 'roads_key': roads_key}
+
+
+def table_route(table, target):
+    """(path, distance) to target from a route table, (None, inf) if unreached"""
+    if target not in table['dist']:
+        return None, float('inf')
+    pred = table['pred']
+    path = [target]
+    while pred[path[-1]] is not None:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return path, table['dist'][target]
+
+
+def _shorter(a, b):
+    """a < b beyond float noise, b may be inf (unreached)"""
+    return a < b and not math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def route_table_survives(table, u, v, weight=None):
+    """True if a table stays exact after road u-v gets weight (None = removed).
+
+    The table is kept if none of its routes use the road and the new
+    weight can't shorten the way to either end.
+    """
+    dist, pred = table['dist'], table['pred']
+    if pred.get(v) == u or pred.get(u) == v:
+        return False
+    if weight is None:
+        return True
+    du, dv = dist.get(u, float('inf')), dist.get(v, float('inf'))
+    return not (_shorter(du + weight, dv) or _shorter(dv + weight, du))
+
+
+def route_table_holds(table, changes):
+    """True if a table survives a whole batch of road changes.
+
+    Each change is checked against the original table: if no route uses
+    a changed road and none of them shortens anything, every unchanged
+    road still satisfies the old distances, so the table is exact.
+    """
+    return all(route_table_survives(table, u, v, w) for u, v, w in changes)
+
+
+def scenario_fingerprint(areas, G, center_location, depots=None):
+    """Hash of the whole scenario (areas, roads, center and depots)"""
+    edges = sorted((min(u, v), max(u, v), float(w)) for u, v, w in G.edges(data='weight'))
+    return fingerprint('scenario', CACHE_VERSION, areas_fingerprint(areas, center_location, depots),
+                       edges)
+
+
+class ResultCache:
+    """Size-bounded on-disk cache of priority lists, route tables and maps.
+
+    Each entry is one pickle file named after its key. Reads refresh the
+    file's modification time, and when the directory grows past max_bytes
+    the least recently used files are deleted first. The directory size
+    is tracked from this process's writes, so the directory is only
+    rescanned once it looks full.
+    """
+
+    def __init__(self, directory="relief_cache", max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _path(self, kind, key):
+        return os.path.join(self.directory, f"{kind}-{key}.pkl")
+
+    def get(self, kind, key):
+        path = self._path(kind, key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, kind, key, value):
+        path = self._path(kind, key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            self.total_bytes -= os.path.getsize(path)
+        except OSError:
+            pass
+        os.replace(tmp_path, path)
+        self.total_bytes += os.path.getsize(path)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until under max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        self.total_bytes = total
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".pkl"):
+                os.remove(entry.path)
+        self.total_bytes = 0
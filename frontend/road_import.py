@@ -0,0 +1,233 @@
+import csv
+import itertools
+import json
+import math
+
+
+# Road vertices closer than ~0.1 m are treated as the same point
+COORD_SCALE = 1e6
+
+
+def vertex_key(lat, lon):
+    return (round(lat * COORD_SCALE), round(lon * COORD_SCALE))
+
+
+def key_location(key):
+    return key[0] / COORD_SCALE, key[1] / COORD_SCALE
+
+
+def iter_polylines(path):
+    """Yield each road as a list of (lat, lon) points.
+
+    .csv      - rows of road_id,lat,lon in drawing order, streamed
+    .geojsonl - one GeoJSON Feature per line, streamed
+    .geojson  - FeatureCollection of LineString / MultiLineString
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            for _, rows in itertools.groupby(reader, key=lambda row: row['road_id']):
+                yield [(float(row['lat']), float(row['lon'])) for row in rows]
+        return
+
+    if path.endswith(".geojsonl") or path.endswith(".geojsons"):
+        with open(path) as f:
+            for line in f:
+                line = line.strip().lstrip("\x1e")
+                if line:
+                    yield from feature_polylines(json.loads(line))
+        return
+
+    with open(path) as f:
+        data = json.load(f)
+    for feature in data.get('features', []):
+        yield from feature_polylines(feature)
+
+
+def feature_polylines(feature):
+    """LineString / MultiLineString coordinates as (lat, lon) lists"""
+    geometry = feature.get('geometry') or {}
+    if geometry.get('type') == 'LineString':
+        lines = [geometry['coordinates']]
+    elif geometry.get('type') == 'MultiLineString':
+        lines = geometry['coordinates']
+    else:
+        return
+    for line in lines:
+        yield [(point[1], point[0]) for point in line]
+
+
+class AreaGrid:
+    """Uniform grid over area coordinates for snapping road vertices.
+
+    Cells are cell_size degrees on both axes. A degree of longitude shrinks
+    with cos(lat), so the east-west search spans enough columns to cover
+    cell_size degrees of latitude worth of distance at the most polar area
+    (plus one cell of margin for vertices slightly further from the equator).
+    """
+
+    def __init__(self, areas, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        max_lat = 0.0
+        for name, info in areas.items():
+            self.cells.setdefault(self.cell(info['lat'], info['lon']), []).append(name)
+            max_lat = max(max_lat, abs(info['lat']))
+        polar = min(max_lat + cell_size, 89.0)
+        self.col_span = math.ceil(1 / math.cos(math.radians(polar)))
+
+    def cell(self, lat, lon):
+        return int(lat // self.cell_size), int(lon // self.cell_size)
+
+    def nearby(self, lat, lon):
+        row, col = self.cell(lat, lon)
+        for dr in (-1, 0, 1):
+            for dc in range(-self.col_span, self.col_span + 1):
+                yield from self.cells.get((row + dr, col + dc), ())
+
+
+def contract_degree_two(adj, keep):
+    """Merge chains of degree-2 nodes into single edges, in place.
+
+    adj: {node: {neighbor: (length, geometry, start_node)}} where geometry
+    is the list of points drawn from start_node to the other end.
+    Nodes in keep (areas and their snap points) are never removed.
+    """
+    stack = [node for node, nbrs in adj.items() if len(nbrs) == 2 and node not in keep]
+    while stack:
+        node = stack.pop()
+        if node in keep or node not in adj or len(adj[node]) != 2:
+            continue
+        (a, edge_a), (b, edge_b) = adj[node].items()
+        if a == b:
+            continue
+
+        # Stitch a -> node -> b into one edge starting at a
+        to_node = oriented(edge_a, a)
+        from_node = oriented(edge_b, node)
+        merged = (edge_a[0] + edge_b[0], to_node + from_node[1:], a)
+
+        del adj[a][node]
+        del adj[b][node]
+        del adj[node]
+        existing = adj[a].get(b)
+        if existing is None or existing[0] > merged[0]:
+            adj[a][b] = merged
+            adj[b][a] = merged
+
+        for end in (a, b):
+            if len(adj[end]) == 2 and end not in keep:
+                stack.append(end)
+
+
+def oriented(edge, start):
+    """Geometry of an adjacency edge drawn from start"""
+    _, geometry, edge_start = edge
+    return geometry if edge_start == start else geometry[::-1]
+
+
+def add_edge(adj, a, b, length, geometry):
+    """Add an edge, keeping the shorter one when a and b are already linked"""
+    if a == b:
+        return
+    existing = adj.setdefault(a, {}).get(b)
+    if existing is None or existing[0] > length:
+        edge = (length, geometry, a)
+        adj[a][b] = edge
+        adj.setdefault(b, {})[a] = edge
+
+
+def import_road_file(system, path, snap_radius=0.5):
+    """Bulk-import a road file into system.G as a contracted junction graph.
+
+    Two streaming passes over the file:
+    1. count how often each vertex is used and find the road vertex
+       nearest to every area (within snap_radius km)
+    2. cut every road at its junctions (ends, shared vertices, snap
+       points) and keep only junction-to-junction edges
+
+    Remaining degree-2 junctions are then contracted, so the graph size
+    follows the junction count instead of the vertex count. The full
+    drawn geometry of every edge is kept in system.road_geometry.
+    With a store attached, junctions, edges and geometry are written to
+    it in batched transactions so hydrate() can load the network back.
+    """
+    # 1 degree of latitude is ~111 km
+    grid = AreaGrid(system.areas, max(snap_radius / 111.0, 1e-6))
+    uses = {}
+    snapped = {}
+    for polyline in iter_polylines(path):
+        for lat, lon in polyline:
+            key = vertex_key(lat, lon)
+            uses[key] = uses.get(key, 0) + 1
+            for area_name in grid.nearby(lat, lon):
+                info = system.areas[area_name]
+                dist = system.calculate_distance(lat, lon, info['lat'], info['lon'])
+                if dist <= snap_radius and (area_name not in snapped or dist < snapped[area_name][0]):
+                    snapped[area_name] = (dist, key)
+
+    snap_points = {key for _, key in snapped.values()}
+    vertices = len(uses)
+
+    adj = {}
+    for polyline in iter_polylines(path):
+        if len(polyline) < 2:
+            continue
+        start = vertex_key(*polyline[0])
+        geometry = [polyline[0]]
+        length = 0.0
+        for i in range(1, len(polyline)):
+            prev_lat, prev_lon = polyline[i - 1]
+            lat, lon = polyline[i]
+            length += system.calculate_distance(prev_lat, prev_lon, lat, lon)
+            geometry.append((lat, lon))
+            key = vertex_key(lat, lon)
+            if i == len(polyline) - 1 or uses[key] > 1 or key in snap_points:
+                add_edge(adj, start, key, length, geometry)
+                start = key
+                geometry = [(lat, lon)]
+                length = 0.0
+    del uses
+
+    # Areas hang off their snap point with a straight connector
+    for area_name, (dist, key) in snapped.items():
+        info = system.areas[area_name]
+        add_edge(adj, area_name, key, dist, [(info['lat'], info['lon']), key_location(key)])
+
+    keep = set(snapped) | snap_points
+    contract_degree_two(adj, keep)
+
+    def node_name(node):
+        return node if node in system.areas else f"J{node[0]}_{node[1]}"
+
+    junction_rows = []
+    for node in adj:
+        if node not in system.areas:
+            lat, lon = key_location(node)
+            system.G.add_node(node_name(node), lat=lat, lon=lon, junction=True)
+            junction_rows.append((node_name(node), lat, lon))
+    junctions = len(junction_rows)
+
+    # Graph updates skip the store; rows go in through one batched bulk_load
+    road_rows = []
+    for a, nbrs in adj.items():
+        for b, edge in nbrs.items():
+            if edge[2] != a:
+                continue  # each undirected edge is stored once from its start
+            from_name, to_name = node_name(a), node_name(b)
+            distance = round(edge[0], 3)
+            system.add_road(from_name, to_name, distance, persist=False)
+            system.road_geometry[(from_name, to_name)] = edge[1]
+            road_rows.append((from_name, to_name, distance, edge[1]))
+    edges = len(road_rows)
+
+    if system.store is not None:
+        system.store.bulk_load(roads=road_rows, junctions=junction_rows)
+
+    return {
+        'vertices': vertices,
+        'junctions': junctions,
+        'edges': edges,
+        'snapped_areas': len(snapped),
+        'unsnapped_areas': [name for name in system.areas if name not in snapped]
+    }
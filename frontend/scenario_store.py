@@ -0,0 +1,247 @@
+import json
+import sqlite3
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS areas (
+    name TEXT PRIMARY KEY,
+    severity INTEGER NOT NULL,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    served INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_areas_severity ON areas (severity);
+CREATE INDEX IF NOT EXISTS idx_areas_location ON areas (lat, lon);
+
+CREATE TABLE IF NOT EXISTS roads (
+    from_area TEXT NOT NULL,
+    to_area TEXT NOT NULL,
+    distance REAL NOT NULL,
+    geometry TEXT,
+    PRIMARY KEY (from_area, to_area)
+);
+CREATE INDEX IF NOT EXISTS idx_roads_to ON roads (to_area);
+
+CREATE TABLE IF NOT EXISTS junctions (
+    name TEXT PRIMARY KEY,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_junctions_location ON junctions (lat, lon);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    name TEXT,
+    report TEXT,
+    priority_list TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    name TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+UPSERT_AREA = """
+INSERT INTO areas (name, severity, lat, lon, served) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(name) DO UPDATE SET
+    severity = excluded.severity, lat = excluded.lat, lon = excluded.lon
+"""
+
+UPSERT_ROAD = """
+INSERT INTO roads (from_area, to_area, distance, geometry) VALUES (?, ?, ?, ?)
+ON CONFLICT(from_area, to_area) DO UPDATE SET
+    distance = excluded.distance, geometry = COALESCE(excluded.geometry, roads.geometry)
+"""
+
+UPSERT_JUNCTION = """
+INSERT INTO junctions (name, lat, lon) VALUES (?, ?, ?)
+ON CONFLICT(name) DO UPDATE SET lat = excluded.lat, lon = excluded.lon
+"""
+
+
+def road_key(from_area, to_area):
+    """Roads are two-way, so each one is stored once under its sorted ends"""
+    return (from_area, to_area) if from_area <= to_area else (to_area, from_area)
+
+
+def road_row(from_area, to_area, distance, geometry=None):
+    """UPSERT_ROAD parameters, geometry stored as JSON running from the first key end"""
+    key = road_key(from_area, to_area)
+    if geometry is not None:
+        points = [list(p) for p in geometry]
+        if key[0] != from_area:
+            points.reverse()
+        geometry = json.dumps(points)
+    return key + (distance, geometry)
+
+
+def decode_geometry(geometry):
+    return None if geometry is None else [tuple(p) for p in json.loads(geometry)]
+
+
+class ScenarioStore:
+    """Local SQLite database holding areas, roads and past runs"""
+
+    def __init__(self, path="relief_scenario.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Databases created before road geometry was stored lack the column
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(roads)")]
+        if columns and 'geometry' not in columns:
+            self.conn.execute("ALTER TABLE roads ADD COLUMN geometry TEXT")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def save_area(self, name, severity, lat, lon, served=False):
+        """Insert or update one area (one small transaction)"""
+        with self.conn:
+            self.conn.execute(UPSERT_AREA, (name, severity, lat, lon, int(served)))
+
+    def save_served(self, name, served=True):
+        """Record whether an area has received relief (areas upserts keep it)"""
+        with self.conn:
+            self.conn.execute("UPDATE areas SET served = ? WHERE name = ?", (int(served), name))
+
+    def save_road(self, from_area, to_area, distance):
+        """Insert or update one road (one small transaction)"""
+        with self.conn:
+            self.conn.execute(UPSERT_ROAD, road_row(from_area, to_area, distance))
+
+    def delete_road(self, from_area, to_area):
+        """Remove a road given either end first"""
+        with self.conn:
+            self.conn.execute("DELETE FROM roads WHERE from_area = ? AND to_area = ?",
+                              road_key(from_area, to_area))
+
+    def bulk_load(self, areas=(), roads=(), junctions=(), batch_size=10000):
+        """Load many areas/roads/junctions in batched transactions.
+
+        areas: iterable of (name, severity, lat, lon)
+        roads: iterable of (from_area, to_area, distance[, geometry])
+        junctions: iterable of (name, lat, lon) road nodes that are not areas
+        All may be generators, so large files never sit in memory whole.
+        """
+        self._executemany(UPSERT_AREA, ((name, severity, lat, lon, 0)
+                                        for name, severity, lat, lon in areas), batch_size)
+        self._executemany(UPSERT_JUNCTION, junctions, batch_size)
+        self._executemany(UPSERT_ROAD, (road_row(*road) for road in roads), batch_size)
+
+    def _executemany(self, statement, rows, batch_size):
+        batch = []
+        for row in rows:
+            batch.append(tuple(row))
+            if len(batch) >= batch_size:
+                with self.conn:
+                    self.conn.executemany(statement, batch)
+                batch = []
+        if batch:
+            with self.conn:
+                self.conn.executemany(statement, batch)
+
+    def count_areas(self):
+        return self.conn.execute("SELECT COUNT(*) FROM areas").fetchone()[0]
+
+    def iter_areas(self, min_severity=None, max_severity=None, bbox=None):
+        """Yield (name, severity, lat, lon, served) rows matching the filters.
+
+        bbox is (min_lat, min_lon, max_lat, max_lon). Both filters are
+        answered from the indexes, nothing else is read.
+        """
+        query = "SELECT name, severity, lat, lon, served FROM areas"
+        conditions = []
+        params = []
+        if min_severity is not None:
+            conditions.append("severity >= ?")
+            params.append(min_severity)
+        if max_severity is not None:
+            conditions.append("severity <= ?")
+            params.append(max_severity)
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            conditions.append("lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?")
+            params.extend([min_lat, max_lat, min_lon, max_lon])
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        for name, severity, lat, lon, served in self.conn.execute(query, params):
+            yield name, severity, lat, lon, bool(served)
+
+    def iter_junctions(self, bbox=None):
+        """Yield (name, lat, lon) of imported road junctions, optionally in a bbox"""
+        if bbox is None:
+            yield from self.conn.execute("SELECT name, lat, lon FROM junctions")
+            return
+        min_lat, min_lon, max_lat, max_lon = bbox
+        yield from self.conn.execute(
+            "SELECT name, lat, lon FROM junctions WHERE lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?",
+            (min_lat, max_lat, min_lon, max_lon))
+
+    def areas_by_severity(self, min_severity, max_severity=10):
+        return list(self.iter_areas(min_severity=min_severity, max_severity=max_severity))
+
+    def areas_in_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        return list(self.iter_areas(bbox=(min_lat, min_lon, max_lat, max_lon)))
+
+    def iter_roads(self, area_names=None):
+        """Yield (from_area, to_area, distance, geometry) roads, optionally only
+        those with both ends in area_names. geometry is a list of (lat, lon)
+        points running from_area -> to_area, or None for hand-entered roads."""
+        if area_names is None:
+            rows = self.conn.execute("SELECT from_area, to_area, distance, geometry FROM roads")
+            for from_area, to_area, distance, geometry in rows:
+                yield from_area, to_area, distance, decode_geometry(geometry)
+            return
+
+        # Look roads up through the primary key / to_area index in chunks
+        names = list(area_names)
+        wanted = set(names)
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT from_area, to_area, distance, geometry FROM roads WHERE from_area IN ({marks})",
+                chunk)
+            for from_area, to_area, distance, geometry in rows:
+                if to_area in wanted:
+                    yield from_area, to_area, distance, decode_geometry(geometry)
+
+    def save_run(self, report, priority_list=None, name=None):
+        """Record a finished allocation run, returns its id"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (created_at, name, report, priority_list) VALUES (?, ?, ?, ?)",
+                (time.time(), name, report,
+                 json.dumps(priority_list) if priority_list is not None else None))
+        return cursor.lastrowid
+
+    def list_runs(self, limit=20):
+        rows = self.conn.execute(
+            "SELECT id, created_at, name FROM runs ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [{'id': r[0], 'created_at': r[1], 'name': r[2]} for r in rows]
+
+    def load_run(self, run_id):
+        row = self.conn.execute(
+            "SELECT report, priority_list FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        return {'report': row[0], 'priority_list': json.loads(row[1]) if row[1] else None}
+
+    def save_blob(self, name, data):
+        """Store derived binary data (e.g. a routing index) with the scenario"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO blobs (name, data) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+                (name, sqlite3.Binary(data)))
+
+    def load_blob(self, name):
+        row = self.conn.execute("SELECT data FROM blobs WHERE name = ?", (name,)).fetchone()
+        return bytes(row[0]) if row else None
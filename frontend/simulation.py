@@ -0,0 +1,160 @@
+import heapq
+import math
+import networkx as nx
+
+
+# Order in which a vehicle picks its next area - smaller key goes first
+DISPATCH_POLICIES = {
+    'priority': lambda severity, dist: (-severity, dist),
+    'nearest': lambda severity, dist: (dist, -severity),
+}
+
+
+def depot_routes(system, depot):
+    """Road distances and routes from a depot to every area.
+
+    Same routes dijkstra_shortest_path returns, but computed with one
+    single-source search per depot instead of one search per trip. Areas
+    without a road connection to the depot are left out.
+    """
+    if system.node_location(depot) is None:
+        raise ValueError(f"Unknown depot: {depot}")
+    if depot not in system.G:
+        return {}
+
+    dist, paths = nx.single_source_dijkstra(system.G, depot, weight='weight')
+    return {area_name: (dist[area_name], paths[area_name])
+            for area_name in dist if area_name in system.areas}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_dispatch_simulation(system, vehicles=None, policy="priority", speed=40.0,
+                            service_time=0.5, escalation_interval=6.0, horizon=168.0):
+    """Discrete-event simulation of relief vehicles serving areas.
+
+    vehicles: {depot: number of vehicles}, defaults to one per placed depot
+    policy: key of DISPATCH_POLICIES used to pick each vehicle's next area
+    speed: km/h, service_time / escalation_interval / horizon: hours
+
+    Each vehicle leaves its depot, drives to the chosen area, unloads for
+    service_time hours and drives back to reload. Unserved areas gain one
+    severity level (max 10) every escalation_interval hours. Events are
+    processed from a heapq ordered by time. Areas with no road to any
+    vehicle depot are listed under 'unreachable' and left out of the
+    time-to-service statistics.
+    """
+    if policy not in DISPATCH_POLICIES:
+        raise ValueError(f"Unknown dispatch policy: {policy}")
+    if vehicles is None:
+        vehicles = {depot: 1 for depot in system.depots}
+    if not vehicles:
+        raise ValueError("No vehicles given and no depots placed")
+    # Vehicles only drive the road network
+    if not any(depot in system.G and system.G.degree(depot) > 0 for depot in vehicles):
+        raise ValueError("No vehicle depot has road access")
+
+    pick_key = DISPATCH_POLICIES[policy]
+    # Areas no depot has a road to are reported apart, not simulated
+    unreachable = system.unreachable_areas(list(vehicles))
+    cut_off = set(unreachable)
+    severity = {name: info['severity'] for name, info in system.areas.items()
+                if name not in cut_off}
+    claimed = set()
+    served = {}
+
+    # One candidate heap per depot; stale entries are skipped lazily
+    routes = {}
+    candidates = {}
+    for depot in vehicles:
+        routes[depot] = depot_routes(system, depot)
+        heap = []
+        for area_name, (dist, _) in routes[depot].items():
+            heap.append(pick_key(severity[area_name], dist) + (area_name, severity[area_name]))
+        heapq.heapify(heap)
+        candidates[depot] = heap
+
+    events = []
+    seq = 0
+    fleet = []
+    for depot, count in vehicles.items():
+        for _ in range(count):
+            heapq.heappush(events, (0.0, seq, 'dispatch', len(fleet)))
+            fleet.append(depot)
+            seq += 1
+    if escalation_interval:
+        heapq.heappush(events, (escalation_interval, seq, 'escalate', None))
+        seq += 1
+
+    processed = 0
+    while events:
+        time, _, kind, payload = heapq.heappop(events)
+        if time > horizon:
+            break
+        processed += 1
+
+        if kind == 'dispatch':
+            depot = fleet[payload]
+            heap = candidates[depot]
+            while heap:
+                entry = heapq.heappop(heap)
+                area_name, pushed_severity = entry[-2], entry[-1]
+                if area_name in claimed or pushed_severity != severity[area_name]:
+                    continue
+                claimed.add(area_name)
+                dist = routes[depot][area_name][0]
+                heapq.heappush(events, (time + dist / speed, seq, 'arrive', (payload, area_name)))
+                seq += 1
+                break
+
+        elif kind == 'arrive':
+            vehicle, area_name = payload
+            depot = fleet[vehicle]
+            served[area_name] = {
+                'name': area_name,
+                'time': time,
+                'severity': severity[area_name],
+                'depot': depot,
+                'route': routes[depot][area_name][1]
+            }
+            back = time + service_time + routes[depot][area_name][0] / speed
+            heapq.heappush(events, (back, seq, 'dispatch', vehicle))
+            seq += 1
+
+        elif kind == 'escalate':
+            for area_name in severity:
+                if area_name in claimed or severity[area_name] >= 10:
+                    continue
+                severity[area_name] += 1
+                for depot, heap in candidates.items():
+                    if area_name not in routes[depot]:
+                        continue
+                    dist = routes[depot][area_name][0]
+                    heapq.heappush(heap, pick_key(severity[area_name], dist) + (area_name, severity[area_name]))
+            if len(claimed) < len(severity):
+                heapq.heappush(events, (time + escalation_interval, seq, 'escalate', None))
+                seq += 1
+
+    waits = sorted(record['time'] for record in served.values())
+    weighted = sum(r['time'] * r['severity'] for r in served.values())
+    total_severity = sum(r['severity'] for r in served.values())
+
+    return {
+        'policy': policy,
+        'vehicles': len(fleet),
+        'events': processed,
+        'served': sorted(served.values(), key=lambda r: r['time']),
+        'unserved': [name for name in severity if name not in served],
+        'unreachable': unreachable,
+        'mean_time': sum(waits) / len(waits) if waits else None,
+        'median_time': percentile(waits, 0.5),
+        'p90_time': percentile(waits, 0.9),
+        'max_time': waits[-1] if waits else None,
+        'severity_weighted_time': weighted / total_severity if total_severity else None
+    }
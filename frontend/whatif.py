@@ -0,0 +1,220 @@
+import heapq
+import math
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+# Typecodes of the arrays shared with worker processes
+ARRAY_TYPES = {
+    'indptr': 'q',       # CSR row offsets, one per node + 1
+    'indices': 'q',      # CSR neighbor node of each edge slot
+    'weights': 'd',      # CSR road length of each edge slot
+    'edge_ids': 'q',     # undirected road id of each edge slot
+    'area_nodes': 'q',   # graph node of each area
+    'severity': 'd',     # base severity of each area
+    'center_dist': 'd',  # distance of each area from its nearest depot (or the center)
+}
+
+_worker_arrays = {}
+_worker_blocks = []
+
+
+def graph_arrays(system, source):
+    """Flatten the road graph and areas into typed CSR arrays"""
+    nodes = list(system.G.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+
+    indptr = array('q', [0])
+    indices = array('q')
+    weights = array('d')
+    edge_ids = array('q')
+    edge_index = {}
+    for node in nodes:
+        for nbr, data in system.G[node].items():
+            key = (min(index[node], index[nbr]), max(index[node], index[nbr]))
+            if key not in edge_index:
+                edge_index[key] = len(edge_index)
+            indices.append(index[nbr])
+            weights.append(float(data.get('weight', 1)))
+            edge_ids.append(edge_index[key])
+        indptr.append(len(indices))
+
+    names = list(system.areas)
+    area_nodes = array('q', (index.get(name, -1) for name in names))
+    severity = array('d', (system.areas[name]['severity'] for name in names))
+    # Same distance allocate_relief scores with: nearest placed depot, else the center
+    depots = list(system.depots.values()) or [system.center_location]
+    center_dist = array('d', (
+        min(system.calculate_distance(lat, lon, system.areas[name]['lat'], system.areas[name]['lon'])
+            for lat, lon in depots)
+        for name in names
+    ))
+
+    arrays = {
+        'indptr': indptr, 'indices': indices, 'weights': weights,
+        'edge_ids': edge_ids, 'area_nodes': area_nodes,
+        'severity': severity, 'center_dist': center_dist,
+    }
+    return names, arrays, index[source], len(edge_index)
+
+
+def share_arrays(arrays):
+    """Copy arrays into shared memory blocks, returns (blocks, layout)"""
+    blocks = []
+    layout = {}
+    for name, values in arrays.items():
+        data = values.tobytes()
+        block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        block.buf[:len(data)] = data
+        blocks.append(block)
+        layout[name] = (block.name, len(values))
+    return blocks, layout
+
+
+def attach_shared_arrays(layout):
+    """Pool initializer: map the shared blocks as typed views, no copies"""
+    for name, (block_name, length) in layout.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        view = block.buf.cast('B')[:length * array(ARRAY_TYPES[name]).itemsize]
+        _worker_arrays[name] = view.cast(ARRAY_TYPES[name])
+
+
+def sample_batch(arrays, source, edge_count, seed, count, severity_sd, road_failure, top_k):
+    """Evaluate count perturbed scenarios, returns per-area partial sums"""
+    indptr = arrays['indptr']
+    indices = arrays['indices']
+    weights = arrays['weights']
+    edge_ids = arrays['edge_ids']
+    area_nodes = arrays['area_nodes']
+    base_severity = arrays['severity']
+    center_dist = arrays['center_dist']
+    n_areas = len(base_severity)
+    n_nodes = len(indptr) - 1
+    rng = random.Random(seed)
+    inf = math.inf
+
+    rank_sum = [0.0] * n_areas
+    rank_sq_sum = [0.0] * n_areas
+    top_hits = [0] * n_areas
+    reach_hits = [0] * n_areas
+    length_sum = [0.0] * n_areas
+
+    for _ in range(count):
+        # Perturbed severities -> priority order (same score as allocate_relief)
+        scores = []
+        for i in range(n_areas):
+            severity = min(10.0, max(1.0, base_severity[i] + rng.gauss(0.0, severity_sd)))
+            scores.append(severity * 10 - center_dist[i])
+        order = sorted(range(n_areas), key=scores.__getitem__, reverse=True)
+        for rank, i in enumerate(order, start=1):
+            rank_sum[i] += rank
+            rank_sq_sum[i] += rank * rank
+            if rank <= top_k:
+                top_hits[i] += 1
+
+        # Random road failures -> Dijkstra from the source over surviving roads
+        failed = bytearray(edge_count)
+        if road_failure > 0:
+            for edge in range(edge_count):
+                if rng.random() < road_failure:
+                    failed[edge] = 1
+
+        dist = [inf] * n_nodes
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for slot in range(indptr[u], indptr[u + 1]):
+                if failed[edge_ids[slot]]:
+                    continue
+                v = indices[slot]
+                nd = d + weights[slot]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+
+        for i in range(n_areas):
+            node = area_nodes[i]
+            if node >= 0 and dist[node] < inf:
+                reach_hits[i] += 1
+                length_sum[i] += dist[node]
+
+    return rank_sum, rank_sq_sum, top_hits, reach_hits, length_sum
+
+
+def _worker_batch(source, edge_count, seed, count, severity_sd, road_failure, top_k):
+    return sample_batch(_worker_arrays, source, edge_count, seed, count,
+                        severity_sd, road_failure, top_k)
+
+
+def run_what_if(system, source, samples=1000, severity_sd=1.0, road_failure=0.05,
+                top_k=10, workers=None, batch_size=50, seed=0):
+    """Monte Carlo robustness of priorities and routes.
+
+    Every sample adds N(0, severity_sd) noise to each severity and fails
+    each road with probability road_failure, then re-ranks areas and
+    re-routes from source. The graph is flattened into CSR arrays that
+    worker processes map from shared memory, so only seeds and counts
+    are pickled per task. Call from under `if __name__ == "__main__":`
+    on Windows, where workers are spawned.
+    """
+    names, arrays, source_index, edge_count = graph_arrays(system, source)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    batches = []
+    remaining = samples
+    batch_seed = seed
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        batches.append((batch_seed, count))
+        remaining -= count
+        batch_seed += 1
+
+    if workers <= 1:
+        partials = [sample_batch(arrays, source_index, edge_count, s, c,
+                                 severity_sd, road_failure, top_k) for s, c in batches]
+    else:
+        blocks, layout = share_arrays(arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=attach_shared_arrays,
+                                     initargs=(layout,)) as pool:
+                futures = [pool.submit(_worker_batch, source_index, edge_count, s, c,
+                                       severity_sd, road_failure, top_k) for s, c in batches]
+                partials = [future.result() for future in futures]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    n_areas = len(names)
+    totals = [[0.0] * n_areas for _ in range(5)]
+    for partial in partials:
+        for total, values in zip(totals, partial):
+            for i, value in enumerate(values):
+                total[i] += value
+    rank_sum, rank_sq_sum, top_hits, reach_hits, length_sum = totals
+
+    base_scores = [arrays['severity'][i] * 10 - arrays['center_dist'][i] for i in range(n_areas)]
+    base_order = sorted(range(n_areas), key=base_scores.__getitem__, reverse=True)
+
+    results = []
+    for base_rank, i in enumerate(base_order, start=1):
+        mean_rank = rank_sum[i] / samples
+        variance = max(0.0, rank_sq_sum[i] / samples - mean_rank ** 2)
+        results.append({
+            'name': names[i],
+            'base_rank': base_rank,
+            'mean_rank': mean_rank,
+            'rank_std': math.sqrt(variance),
+            'top_k_probability': top_hits[i] / samples,
+            'reachability': reach_hits[i] / samples,
+            'expected_route_length': length_sum[i] / reach_hits[i] if reach_hits[i] else None
+        })
+    return results